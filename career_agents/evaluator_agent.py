@@ -18,9 +18,9 @@ gemini_model = OpenAIChatCompletionsModel(
 )
 
 
-def create_evaluator_agent(name: str, summary: str) -> Agent:
-    """Create an evaluator agent for the given person."""
-    instructions = f"""You are an evaluator that decides whether a response is acceptable quality.
+# Static template built once at import; create_evaluator_agent only fills
+# in the name/summary placeholders
+_INSTRUCTIONS_TEMPLATE = """You are an evaluator that decides whether a response is acceptable quality.
 You evaluate responses from an AI agent that is playing the role of {name} on their career website.
 
 The agent should be:
@@ -36,6 +36,11 @@ Evaluate the response and provide:
 - is_acceptable: true if the response meets quality standards, false otherwise
 - feedback: specific feedback about what was good or what needs improvement"""
 
+
+def create_evaluator_agent(name: str, summary: str) -> Agent:
+    """Create an evaluator agent for the given person."""
+    instructions = _INSTRUCTIONS_TEMPLATE.format(name=name, summary=summary)
+
     return Agent(
         name="Response Evaluator",
         instructions=instructions,
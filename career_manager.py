@@ -1,7 +1,42 @@
-from agents import Runner, trace, InputGuardrailTripwireTriggered
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from agents import MaxTurnsExceeded, Runner, trace
 from openai.types.responses import ResponseTextDeltaEvent
-from database import seed_database
+from database import seed_database, embed_text
 from career_agents import create_career_agent
+from career_agents.guardrails import check_input, is_blocked
+
+# Reply shown when a guardrail blocks the incoming message
+BLOCKED_MESSAGE = "I'd be happy to discuss Sam's career, skills, and experience. What would you like to know?"
+
+# Reply shown when a turn exhausts its model round-trip budget
+TURN_LIMIT_MESSAGE = "Sorry, I wasn't able to finish putting that answer together. Could you try asking again, perhaps with a more specific question?"
+
+# Bound on the in-memory response cache (entries are plain strings)
+RESPONSE_CACHE_SIZE = 256
+
+# Near-duplicate questions ("what are your skills" / "tell me your
+# skills") reuse a cached reply when at least this similar and fresh
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_TTL = 3600  # seconds
+
+# Budget on model round-trips per turn; with parallel tool calls enabled
+# a normal turn needs two (tools, then the final answer)
+MAX_AGENT_TURNS = 5
+
+# When the full history must be resent (no resumable session), only the
+# last K exchanges go to the model, bounding prefill cost per turn
+HISTORY_WINDOW_TURNS = 6
+
+# Minimum spacing between streamed UI updates: deltas arriving faster
+# than ~30 Hz are coalesced, since Gradio pushes the whole message list
+# per yield and no human perceives refreshes beyond this rate
+STREAM_YIELD_INTERVAL = 0.03  # seconds
 
 
 class CareerManager:
@@ -13,8 +48,12 @@ class CareerManager:
         with open("me/summary.md", "r", encoding="utf-8") as f:
             self.summary = f.read()
 
-        # Initialize and seed the Q&A database
-        seed_database()
+        # Seed the Q&A database in the background so startup overlaps
+        # with Gradio initialization; the first real turn joins this
+        # thread before the agent needs the data. Warm boots reduce to a
+        # single COUNT probe.
+        self._seed_thread = threading.Thread(target=seed_database, daemon=True)
+        self._seed_thread.start()
 
         # Create the main career agent
         self.agent = create_career_agent(
@@ -22,28 +61,152 @@ class CareerManager:
             summary=self.summary
         )
 
+        # LRU cache of final responses, keyed by the normalized message
+        # plus a hash of the recent history so follow-ups stay contextual
+        self._response_cache: OrderedDict[str, str] = OrderedDict()
+
+        # Semantic layer: (embedding, reply, stored_at) triples matched
+        # by cosine similarity for near-duplicate questions
+        self._semantic_cache: list = []
+
+        # Server-side session state, keyed by a hash of the exact history
+        # content a completed turn left behind. A turn whose incoming
+        # history matches a stored head resumes that response id with
+        # only the new user message, keeping input tokens O(1) per turn.
+        # Content keying (not length) means concurrent visitors sharing
+        # this manager can never resume each other's conversations.
+        self._session_heads: OrderedDict[str, str] = OrderedDict()
+
+    @staticmethod
+    def _history_key(history: list) -> str:
+        content = json.dumps(
+            [[m["role"], m["content"]] for m in history]
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _store_session_head(self, key: str, response_id: str):
+        self._session_heads[key] = response_id
+        self._session_heads.move_to_end(key)
+        while len(self._session_heads) > RESPONSE_CACHE_SIZE:
+            self._session_heads.popitem(last=False)
+
+    @staticmethod
+    def _cache_key(message: str, history: list) -> str:
+        normalized = message.lower().strip()
+        tail = json.dumps(
+            [{"role": m["role"], "content": m["content"]} for m in history[-2:]]
+        )
+        return hashlib.sha256((normalized + "\0" + tail).encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str):
+        reply = self._response_cache.get(key)
+        if reply is not None:
+            self._response_cache.move_to_end(key)
+        return reply
+
+    def _cache_put(self, key: str, reply: str):
+        self._response_cache[key] = reply
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+
+    async def _semantic_get(self, message: str):
+        """Look up a fresh, semantically similar cached reply."""
+        if not self._semantic_cache:
+            return None
+
+        query = await asyncio.to_thread(embed_text, message)
+        now = time.monotonic()
+        self._semantic_cache = [
+            entry for entry in self._semantic_cache
+            if now - entry[2] < SEMANTIC_CACHE_TTL
+        ]
+
+        best_reply, best_score = None, 0.0
+        for embedding, reply, _ in self._semantic_cache:
+            score = float(embedding @ query)
+            if score > best_score:
+                best_reply, best_score = reply, score
+
+        if best_score >= SEMANTIC_CACHE_THRESHOLD:
+            return best_reply
+        return None
+
+    async def _semantic_put(self, message: str, reply: str):
+        embedding = await asyncio.to_thread(embed_text, message)
+        self._semantic_cache.append((embedding, reply, time.monotonic()))
+        if len(self._semantic_cache) > RESPONSE_CACHE_SIZE:
+            self._semantic_cache.pop(0)
+
     async def run(self, message: str, history: list):
         """Run the career conversation, yielding status updates and responses."""
-        # Add user message to history and yield immediately
-        history = history + [{"role": "user", "content": message}]
+        cache_key = self._cache_key(message, history)
+        # Semantic matching is only safe without earlier context; a
+        # follow-up like "tell me more" must not reuse an old reply
+        is_first_turn = len(history) == 0
+
+        # The server can resume only when this exact history content was
+        # produced by a completed turn; anything else (another visitor's
+        # session, a cache-served turn, a restart) misses and falls back
+        # to resending the history
+        resume_id = self._session_heads.get(self._history_key(history))
+        use_session = resume_id is not None
+
+        # Copy once so Gradio's list is never mutated, then append in
+        # place for the rest of the turn instead of rebuilding the list
+        history = list(history)
+        history.append({"role": "user", "content": message})
         yield history
 
-        # Build input for the agent
-        input_items = [{"role": m["role"], "content": m["content"]} for m in history]
+        # Repeats (especially the canned example prompts) skip the agent
+        # and its token spend entirely
+        cached_reply = self._cache_get(cache_key)
+        if cached_reply is None and is_first_turn:
+            cached_reply = await self._semantic_get(message)
+        if cached_reply is not None:
+            history.append({"role": "assistant", "content": cached_reply})
+            yield history
+            return
 
-        try:
-            with trace("Career Conversation"):
-                # Run the agent with streaming
-                result = Runner.run_streamed(
-                    self.agent,
-                    input=input_items,
-                )
+        # Build input for the agent: just the new message when resuming
+        # a server-side session, a sliding window of recent turns
+        # otherwise so long sessions don't inflate input tokens unbounded
+        if use_session:
+            input_items = [{"role": "user", "content": message}]
+        else:
+            window = history[-2 * HISTORY_WINDOW_TURNS:]
+            input_items = [{"role": m["role"], "content": m["content"]} for m in window]
 
-                # Add assistant message placeholder with thinking indicator
-                history = history + [{"role": "assistant", "content": "..."}]
+        # Make sure seeding has finished before the agent can hit the
+        # database; after the first turn this is a no-op
+        if self._seed_thread.is_alive():
+            await asyncio.to_thread(self._seed_thread.join)
+
+        with trace("Career Conversation"):
+            # Screen the input first: blocking before the agent starts
+            # means no streamed tokens are generated and discarded
+            verdict = await check_input(message)
+            if is_blocked(verdict):
+                print(f"Guardrail triggered: {verdict.reasoning}")
+                history.append({"role": "assistant", "content": BLOCKED_MESSAGE})
                 yield history
+                return
+
+            # Run the agent with streaming
+            result = Runner.run_streamed(
+                self.agent,
+                input=input_items,
+                max_turns=MAX_AGENT_TURNS,
+                previous_response_id=resume_id,
+            )
+
+            # Add assistant message placeholder with thinking indicator
+            history.append({"role": "assistant", "content": "..."})
+            yield history
 
-                first_token = True
+            first_token = True
+            last_yield = 0.0
+            try:
                 async for event in result.stream_events():
                     if event.type == "raw_response_event":
                         if isinstance(event.data, ResponseTextDeltaEvent):
@@ -52,9 +215,23 @@ class CareerManager:
                                 first_token = False
                             else:
                                 history[-1]["content"] += event.data.delta
-                            yield history
+                            now = time.monotonic()
+                            if now - last_yield >= STREAM_YIELD_INTERVAL:
+                                last_yield = now
+                                yield history
+            except MaxTurnsExceeded:
+                # The runaway-loop cap fired; reply gracefully instead of
+                # surfacing a raw error, and cache nothing from this turn
+                history[-1]["content"] = TURN_LIMIT_MESSAGE
+                yield history
+                return
 
-        except InputGuardrailTripwireTriggered as e:
-            print(f"Guardrail triggered: {e}")
-            history = history + [{"role": "assistant", "content": "I'd be happy to discuss Sam's career, skills, and experience. What would you like to know?"}]
-            yield history
+            if not first_token:
+                # Flush whatever the rate limiter held back at stream end
+                yield history
+                self._store_session_head(
+                    self._history_key(history), result.last_response_id
+                )
+                self._cache_put(cache_key, history[-1]["content"])
+                if is_first_turn:
+                    await self._semantic_put(message, history[-1]["content"])
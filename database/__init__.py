@@ -1,7 +1,13 @@
 from .qa_database import (
     init_database,
     fetch_all_qa,
+    iter_qa,
+    fetch_recent_qa,
+    count_qa,
+    db_version,
+    search_qa_fts,
     insert_qa,
+    insert_qa_many,
     update_qa,
     delete_qa,
     parse_qa_from_summary,
@@ -13,11 +19,24 @@ from .qa_database import (
     dismiss_unknown_question,
     answer_unknown_question,
 )
+from .embeddings import (
+    embed_text,
+    ensure_index,
+    index_ready,
+    invalidate_index,
+    search as search_embeddings,
+)
 
 __all__ = [
     "init_database",
     "fetch_all_qa",
+    "iter_qa",
+    "fetch_recent_qa",
+    "count_qa",
+    "db_version",
+    "search_qa_fts",
     "insert_qa",
+    "insert_qa_many",
     "update_qa",
     "delete_qa",
     "parse_qa_from_summary",
@@ -28,4 +47,10 @@ __all__ = [
     "fetch_unknown_questions",
     "dismiss_unknown_question",
     "answer_unknown_question",
+    # Embedding-based search
+    "embed_text",
+    "ensure_index",
+    "index_ready",
+    "invalidate_index",
+    "search_embeddings",
 ]
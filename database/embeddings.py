@@ -0,0 +1,278 @@
+import hashlib
+import sqlite3
+import threading
+
+import numpy as np
+from openai import OpenAI
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = 1536
+CACHE_DB_PATH = "me/embeddings.sqlite"
+
+# Minimum cosine similarity for an embedding match to count as a hit
+MATCH_THRESHOLD = 0.85
+
+# Bound on the in-memory embedding cache (vectors are ~6 KB each)
+MEMORY_CACHE_SIZE = 10_000
+
+_openai_client = None
+
+# Two-level embedding cache: in-memory dict in front of an on-disk
+# SQLite table, both keyed by sha256(model + "\0" + text).
+_memory_cache: dict = {}
+
+# In-memory index state, rebuilt lazily from the Q&A table. _index is
+# the FAISS index when FAISS is installed; _matrix/_row_scales are the
+# NumPy fallback: one contiguous (N, dim) int8 matrix of symmetrically
+# quantized rows plus each row's float32 dequantization scale.
+_index = None
+_matrix = None
+_row_scales = None
+_questions = []
+_answers = []
+
+
+def _get_client() -> OpenAI:
+    """Return a shared OpenAI client, created on first use."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = OpenAI()
+    return _openai_client
+
+
+def _cache_key(text: str) -> bytes:
+    return hashlib.sha256((EMBEDDING_MODEL + "\0" + text).encode("utf-8")).digest()
+
+
+# One persistent connection for the disk cache, shared across threads
+# under a lock; the schema DDL runs once instead of on every access
+_cache_db = None
+_cache_db_lock = threading.Lock()
+
+
+def _cache_conn() -> sqlite3.Connection:
+    global _cache_db
+    if _cache_db is None:
+        conn = sqlite3.connect(CACHE_DB_PATH, check_same_thread=False)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key BLOB PRIMARY KEY,
+                vec BLOB NOT NULL
+            )
+        """)
+        conn.commit()
+        _cache_db = conn
+    return _cache_db
+
+
+def _cache_get(key: bytes):
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    with _cache_db_lock:
+        row = _cache_conn().execute(
+            "SELECT vec FROM embeddings WHERE key = ?", (key,)
+        ).fetchone()
+
+    if row is None:
+        return None
+
+    vec = np.frombuffer(row[0], dtype=np.float32).copy()
+    _cache_put_memory(key, vec)
+    return vec
+
+
+def _cache_put_memory(key: bytes, vec: np.ndarray):
+    if len(_memory_cache) >= MEMORY_CACHE_SIZE:
+        _memory_cache.pop(next(iter(_memory_cache)))
+    _memory_cache[key] = vec
+
+
+def _cache_put(key: bytes, vec: np.ndarray):
+    _cache_put_many([(key, vec)])
+
+
+def _cache_put_many(items):
+    """Persist (key, vector) pairs in one transaction (one fsync)."""
+    with _cache_db_lock:
+        conn = _cache_conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                [(key, vec.tobytes()) for key, vec in items],
+            )
+    for key, vec in items:
+        _cache_put_memory(key, vec)
+
+
+def embed_text(text: str) -> np.ndarray:
+    """Embed a single text, returning a unit-normalized float32 vector.
+
+    Results are cached in memory and on disk, so repeated queries and
+    re-seeding never re-pay the embedding API round-trip.
+    """
+    key = _cache_key(text)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    response = _get_client().embeddings.create(model=EMBEDDING_MODEL, input=text)
+    vec = np.array(response.data[0].embedding, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    if norm > 0:
+        vec /= norm
+
+    _cache_put(key, vec)
+    return vec
+
+
+def embed_texts(texts) -> list:
+    """Embed many texts, batching all cache misses into one API call.
+
+    The embeddings endpoint accepts arrays, so N misses cost a single
+    HTTP round-trip instead of N.
+    """
+    keys = [_cache_key(text) for text in texts]
+    vectors = [_cache_get(key) for key in keys]
+
+    missing = [i for i, vec in enumerate(vectors) if vec is None]
+    if missing:
+        response = _get_client().embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=[texts[i] for i in missing],
+        )
+        fresh = []
+        for i, item in zip(missing, response.data):
+            vec = np.array(item.embedding, dtype=np.float32)
+            norm = np.linalg.norm(vec)
+            if norm > 0:
+                vec /= norm
+            fresh.append((keys[i], vec))
+            vectors[i] = vec
+        # All misses hit disk as a single transaction
+        _cache_put_many(fresh)
+
+    return vectors
+
+
+def _quantize(vec: np.ndarray):
+    """Symmetrically quantize a float32 vector to (int8 codes, scale)."""
+    scale = float(np.abs(vec).max()) / 127.0
+    if scale == 0.0:
+        scale = 1.0
+    return np.round(vec / scale).astype(np.int8), scale
+
+
+def invalidate_index():
+    """Drop the in-memory index so it gets rebuilt on next search."""
+    global _index, _matrix, _row_scales, _questions, _answers
+    _index = None
+    _matrix = None
+    _row_scales = None
+    _questions = []
+    _answers = []
+
+
+def index_ready() -> bool:
+    """Whether the vector index is built and usable."""
+    return _index is not None or _matrix is not None
+
+
+def ensure_index(qa_pairs):
+    """Build the vector index from Q&A pairs if it isn't built yet."""
+    global _index, _matrix, _row_scales, _questions, _answers
+
+    if index_ready() or not qa_pairs:
+        return
+
+    questions = [qa["question"] for qa in qa_pairs]
+    answers = [qa["answer"] for qa in qa_pairs]
+
+    vectors = np.stack(embed_texts(questions))
+
+    if faiss is not None:
+        # Scalar-quantize stored vectors to int8: ~4x smaller than
+        # float32 with negligible recall loss at this corpus size. The
+        # raw float32 vectors stay in the on-disk cache for rebuilds.
+        index = faiss.IndexScalarQuantizer(
+            EMBEDDING_DIM, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(vectors)
+        index.add(vectors)
+        _index = index
+    else:
+        # NumPy fallback: store rows int8-quantized (4x smaller than
+        # float32) and score with one integer matrix-vector product,
+        # rescaled per row afterwards
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0.0] = 1.0
+        _matrix = np.ascontiguousarray(
+            np.round(vectors / scales[:, None]), dtype=np.int8
+        )
+        _row_scales = scales.astype(np.float32)
+
+    _questions = questions
+    _answers = answers
+
+
+def add_to_index(question: str, answer: str):
+    """Append one Q&A pair to the built index without a full rebuild.
+
+    No-op when the index isn't built yet; the next search builds it from
+    the table anyway.
+    """
+    global _matrix, _row_scales
+
+    if not index_ready():
+        return
+
+    vec = embed_text(question)
+    if _index is not None:
+        _index.add(vec.reshape(1, -1))
+    else:
+        codes, scale = _quantize(vec)
+        _matrix = np.ascontiguousarray(np.vstack([_matrix, codes]), dtype=np.int8)
+        _row_scales = np.append(_row_scales, np.float32(scale))
+    _questions.append(question)
+    _answers.append(answer)
+
+
+def search(question: str):
+    """Search the index for the closest stored question.
+
+    Returns {"question", "answer", "score"} when the best match clears
+    MATCH_THRESHOLD, otherwise None. Also returns None when no index is
+    built, so callers can fall back.
+    """
+    if not index_ready():
+        return None
+
+    query = embed_text(question)
+
+    if _index is not None:
+        scores, indices = _index.search(query.reshape(1, -1), 1)
+        score = float(scores[0][0])
+        best = int(indices[0][0])
+    else:
+        # Integer dot products with int32 accumulation, dequantized by
+        # the combined row/query scales
+        codes, scale = _quantize(query)
+        sims = (_matrix.astype(np.int32) @ codes.astype(np.int32)) * (
+            _row_scales * np.float32(scale)
+        )
+        best = int(sims.argmax())
+        score = float(sims[best])
+
+    if best < 0 or score < MATCH_THRESHOLD:
+        return None
+
+    return {
+        "question": _questions[best],
+        "answer": _answers[best],
+        "score": score,
+    }
@@ -1,17 +1,11 @@
 from .schemas import (
     Evaluation,
     ChatSummary,
-    InappropriateContentOutput,
-    PromptInjectionOutput,
-    OffTopicOutput,
-    CompetitorMentionOutput,
+    CombinedGuardrailOutput,
 )
 
 __all__ = [
     "Evaluation",
     "ChatSummary",
-    "InappropriateContentOutput",
-    "PromptInjectionOutput",
-    "OffTopicOutput",
-    "CompetitorMentionOutput",
+    "CombinedGuardrailOutput",
 ]
@@ -1,15 +1,21 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List
 
 
 class Evaluation(BaseModel):
     """Model for response evaluation results."""
+    # All schemas here are read-only results; frozen models hash/compare
+    # cheaply and skip mutation bookkeeping
+    model_config = ConfigDict(frozen=True)
+
     is_acceptable: bool
     feedback: str
 
 
 class ChatSummary(BaseModel):
     """Model for email chat summary."""
+    model_config = ConfigDict(frozen=True)
+
     user_name: str = Field(description="User's name if provided, otherwise 'Visitor'")
     user_email: str = Field(description="User's email address")
     topics_discussed: List[str] = Field(description="Main topics covered in conversation")
@@ -18,25 +24,13 @@ class ChatSummary(BaseModel):
     notable_questions: List[str] = Field(description="Key questions the user asked")
 
 
-class InappropriateContentOutput(BaseModel):
-    """Output model for inappropriate content guardrail."""
-    is_inappropriate: bool
-    reasoning: str
+class CombinedGuardrailOutput(BaseModel):
+    """Output model for the fused input guardrail classifier."""
+    model_config = ConfigDict(frozen=True)
 
-
-class PromptInjectionOutput(BaseModel):
-    """Output model for prompt injection guardrail."""
+    is_inappropriate: bool
     is_injection_attempt: bool
-    reasoning: str
-
-
-class OffTopicOutput(BaseModel):
-    """Output model for off-topic guardrail."""
     is_off_topic: bool
-    reasoning: str
-
-
-class CompetitorMentionOutput(BaseModel):
-    """Output model for competitor mention guardrail."""
     mentions_competitor: bool
     competitor_names: List[str] = Field(default_factory=list)
+    reasoning: str
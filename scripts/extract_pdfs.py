@@ -0,0 +1,54 @@
+"""Extract me/linkedin.pdf and me/resume.pdf to plain-text files.
+
+Run this offline whenever the PDFs change, so nothing at serving time
+ever needs to decode a PDF:
+
+    python scripts/extract_pdfs.py
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from pypdf import PdfReader
+
+PDF_SOURCES = {
+    "me/linkedin.pdf": "me/linkedin.txt",
+    "me/resume.pdf": "me/resume.txt",
+}
+
+
+def extract_pdf_text(pdf_path: str) -> str:
+    """Extract all page text from a PDF into a single string.
+
+    Pages are independent, so they're extracted in parallel; ex.map
+    keeps the results in page order.
+    """
+    reader = PdfReader(pdf_path)
+    pages = reader.pages
+    with ThreadPoolExecutor(max_workers=min(8, max(1, len(pages)))) as ex:
+        parts = ex.map(lambda page: page.extract_text() or "", pages)
+        return "".join(parts)
+
+
+def is_up_to_date(pdf_path: str, txt_path: str) -> bool:
+    """Whether the extracted text is newer than its source PDF."""
+    try:
+        return os.path.getmtime(txt_path) >= os.path.getmtime(pdf_path)
+    except OSError:
+        return False
+
+
+def main():
+    for pdf_path, txt_path in PDF_SOURCES.items():
+        # Extraction is deterministic, so skip PDFs that haven't changed
+        if is_up_to_date(pdf_path, txt_path):
+            print(f"Skipping {pdf_path} ({txt_path} is up to date)")
+            continue
+        text = extract_pdf_text(pdf_path)
+        with open(txt_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"Extracted {pdf_path} -> {txt_path} ({len(text)} chars)")
+
+
+if __name__ == "__main__":
+    main()
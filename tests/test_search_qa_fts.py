@@ -0,0 +1,64 @@
+"""Regression tests for the FTS keyword-match stage.
+
+With OR-of-all-tokens matching, unrelated questions ("What is your
+favorite color?") matched stored answers on shared filler words alone
+and were returned as authoritative results.
+"""
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")  # pulled in via database.embeddings
+
+from database import qa_database as db
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Questions sharing only function words with the seed corpus; each used
+# to come back as a confident wrong match
+UNRELATED_QUESTIONS = [
+    "What is your favorite color?",
+    "Can you help me fix my printer?",
+    "Tell me about your dog",
+]
+
+STORED_QUESTIONS = [
+    "Tell me about yourself",
+    "What certifications do you have?",
+    "What's your experience with AWS?",
+]
+
+
+@pytest.fixture()
+def seeded_db(tmp_path, monkeypatch):
+    """A fresh database seeded with the real summary + resume corpus."""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "qa.db"))
+    monkeypatch.setattr(db._local, "conn", None, raising=False)
+    monkeypatch.setattr(db, "_schema_ready", False)
+    monkeypatch.setattr(db, "_qa_cache", None)
+
+    summary_qa = db.parse_qa_from_summary(str(REPO_ROOT / "me" / "summary.md"))
+    db.insert_qa_many(
+        [
+            (qa["question"], qa["answer"])
+            for qa in [*summary_qa, *db.get_resume_linkedin_qa()]
+        ]
+    )
+    return db
+
+
+def test_unrelated_questions_do_not_match(seeded_db):
+    for question in UNRELATED_QUESTIONS:
+        assert seeded_db.search_qa_fts(question) is None
+
+
+def test_stored_questions_still_match(seeded_db):
+    for question in STORED_QUESTIONS:
+        hit = seeded_db.search_qa_fts(question)
+        assert hit is not None
+        assert hit["question"] == question
+
+
+def test_all_stopword_question_returns_none(seeded_db):
+    assert seeded_db.search_qa_fts("Who are you?") is None
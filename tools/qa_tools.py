@@ -1,7 +1,38 @@
-import json
+try:
+    import orjson as json  # C-accelerated, 2-5x faster parsing
+except ImportError:
+    import json
+
+import re
+from functools import lru_cache
+
 from openai import OpenAI
 from agents import function_tool
-from database import fetch_all_qa, insert_qa, update_qa, record_unknown
+from database import (
+    fetch_all_qa,
+    iter_qa,
+    fetch_recent_qa,
+    count_qa,
+    db_version,
+    insert_qa,
+    update_qa,
+    record_unknown,
+    search_qa_fts,
+    ensure_index,
+    index_ready,
+    search_embeddings,
+)
+
+# Shared OpenAI client so every tool call reuses the same httpx
+# connection pool instead of rebuilding a client (and TLS session) per call
+_openai_client = None
+
+
+def _get_client() -> OpenAI:
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = OpenAI()
+    return _openai_client
 
 
 @function_tool
@@ -21,24 +52,121 @@ def record_unknown_question(question: str) -> dict:
     }
 
 
-@function_tool
-def search_qa_database(question: str) -> dict:
-    """Search the Q&A database for semantically similar questions.
-    Use this BEFORE answering any question to check if there's already a stored answer.
-    This helps provide consistent, accurate responses.
+def _normalize_question(question: str) -> str:
+    return re.sub(r"\W+", " ", question.lower()).strip()
 
-    Args:
-        question: The user's question to search for in the database
-    """
-    qa_pairs = fetch_all_qa()
 
-    if not qa_pairs:
+# Normalized question -> answer map for exact-match hits, rebuilt only
+# when the database version changes
+_exact_cache: tuple = (None, None)  # (db_version, dict)
+
+
+def _exact_answer(norm_question: str):
+    global _exact_cache
+    version = db_version()
+    if _exact_cache[0] != version:
+        _exact_cache = (
+            version,
+            {
+                _normalize_question(question): answer
+                for question, answer in iter_qa()
+            },
+        )
+    return _exact_cache[1].get(norm_question)
+
+
+# Token-overlap (Jaccard) prefilter bounds: a stored question this
+# similar is returned outright, and when nothing even grazes the floor
+# the expensive embedding/LLM stages are skipped entirely
+JACCARD_ACCEPT = 0.7
+JACCARD_REJECT = 0.1
+
+# How many overlap-ranked candidates the LLM matcher sees, and a cap on
+# its reply (a matched answer echoed back as JSON)
+LLM_CANDIDATES = 5
+LLM_MAX_TOKENS = 512
+
+
+def _overlap_scores(norm_question: str) -> list:
+    """Score every stored question by Jaccard overlap with the query."""
+    tokens = set(norm_question.split())
+    scored = []
+    if not tokens:
+        return scored
+
+    for stored_question, stored_answer in iter_qa():
+        stored_tokens = set(_normalize_question(stored_question).split())
+        if not stored_tokens:
+            continue
+        overlap = len(tokens & stored_tokens)
+        score = overlap / (len(tokens) + len(stored_tokens) - overlap)
+        scored.append((score, stored_question, stored_answer))
+
+    return scored
+
+
+def _best_token_overlap(norm_question: str):
+    """Return (best Jaccard score, its answer) over the stored questions."""
+    scored = _overlap_scores(norm_question)
+    if not scored:
+        return 0.0, None
+    score, _, answer = max(scored, key=lambda item: item[0])
+    return score, answer
+
+
+@lru_cache(maxsize=512)
+def _search_qa(question: str) -> dict:
+    """Cached search pipeline behind search_qa_database.
+
+    Keyed by the normalized question, so repeat lookups across a session
+    skip SQLite, the embedding call, and the LLM fallback entirely. The
+    cache is cleared whenever a tool writes to the database.
+    """
+    if count_qa() == 0:
         return {"found": False, "answer": None, "message": "Database is empty"}
 
-    context = "\n\n".join([f"Q: {qa['question']}\nA: {qa['answer']}" for qa in qa_pairs])
+    # A question stored verbatim (modulo case/punctuation) is a dict
+    # lookup; nothing cheaper exists.
+    exact = _exact_answer(question)
+    if exact is not None:
+        return {"found": True, "answer": exact}
+
+    # Next an in-process FTS5 keyword match: costs microseconds and no
+    # network at all.
+    fts_match = search_qa_fts(question)
+    if fts_match:
+        return {"found": True, "answer": fts_match["answer"]}
+
+    # Cheap token-overlap pass over the stored questions: near-verbatim
+    # rewordings return directly, and questions sharing almost no
+    # vocabulary with the corpus skip the network stages below.
+    overlap_score, overlap_answer = _best_token_overlap(question)
+    if overlap_score >= JACCARD_ACCEPT:
+        return {"found": True, "answer": overlap_answer}
+    if overlap_score < JACCARD_REJECT:
+        return {"found": False, "answer": None}
+
+    # Next, the local vector index: one embedding call plus a dot
+    # product, instead of shipping the whole database to the LLM.
+    if not index_ready():
+        ensure_index(fetch_all_qa())
+    match = search_embeddings(question)
+    if match:
+        return {"found": True, "answer": match["answer"]}
+
+    # Fall back to the LLM matcher when the index is unavailable or no
+    # stored question scores above the similarity threshold. Only the
+    # top overlap-ranked candidates go into the prompt, so token cost
+    # stays O(K) regardless of database size.
+    candidates = sorted(
+        _overlap_scores(question), key=lambda item: item[0], reverse=True
+    )[:LLM_CANDIDATES]
+    context = "\n\n".join(
+        f"Q: {stored_question}\nA: {stored_answer}"
+        for _, stored_question, stored_answer in candidates
+    )
 
-    openai_client = OpenAI()
-    response = openai_client.chat.completions.create(
+    response = _get_client().chat.completions.create(
         model="gpt-4o-mini",
         messages=[
             {
@@ -61,13 +189,27 @@ Here is the Q&A database:
                 "content": f"Does this question match any in the database? Question: {question}"
             }
         ],
-        response_format={"type": "json_object"}
+        response_format={"type": "json_object"},
+        temperature=0,
+        max_tokens=LLM_MAX_TOKENS,
     )
 
     result = json.loads(response.choices[0].message.content)
     return result
 
 
+@function_tool
+def search_qa_database(question: str) -> dict:
+    """Search the Q&A database for semantically similar questions.
+    Use this BEFORE answering any question to check if there's already a stored answer.
+    This helps provide consistent, accurate responses.
+
+    Args:
+        question: The user's question to search for in the database
+    """
+    return _search_qa(_normalize_question(question))
+
+
 @function_tool
 def add_qa_to_database(question: str, answer: str) -> dict:
     """Add a new question and answer pair to the database.
@@ -78,6 +220,7 @@ def add_qa_to_database(question: str, answer: str) -> dict:
         answer: The answer to the question
     """
     insert_qa(question, answer)
+    _search_qa.cache_clear()
     return {"added": True, "message": "Successfully added Q&A pair to database"}
 
 
@@ -89,8 +232,7 @@ def list_recent_qa(limit: int = 5) -> dict:
     Args:
         limit: Maximum number of Q&A pairs to retrieve (default: 5)
     """
-    qa_pairs = fetch_all_qa()
-    recent = qa_pairs[:limit]
+    recent = fetch_recent_qa(limit)
 
     return {
         "count": len(recent),
@@ -111,6 +253,7 @@ def update_qa_answer(question: str, new_answer: str) -> dict:
     updated = update_qa(question, new_answer)
 
     if updated:
+        _search_qa.cache_clear()
         return {"updated": True, "message": f"Successfully updated answer for: {question}"}
     else:
         return {"updated": False, "message": f"Question not found: {question}"}